@@ -1,28 +1,74 @@
 import streamlit as st
-import speech_recognition as sr
-from textblob import TextBlob
 from datetime import datetime
-import matplotlib.pyplot as plt
-import pandas as pd
-from deep_translator import GoogleTranslator
-from gtts import gTTS
-from io import BytesIO
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+import os
+from concurrent.futures import ThreadPoolExecutor
 from st_audiorec import st_audiorec   # 🎙 mic recorder
-from wordcloud import WordCloud       # ☁️ word cloud
+from chat_engine import ChatEngine, ChatState
+from chat_server import BatchScheduler
+from translation import Translator
+from pipeline import MessagePipeline
+from speech import StreamingRecognizer
+from sentiment import score_polarity
+from tts import TTSEngine
+from dashboard import DashboardState, PanelProfiler
+from model_loader import ModelLoader
 
 # -------------------- LOAD CHATBOT --------------------
+@st.cache_resource
+def load_model_loader():
+    # loads on a background thread while the page renders; torch/transformers are imported there
+    # CHATBOT_QUANTIZE=1 applies dynamic int8 quantization, CHATBOT_SNAPSHOT=dir reuses a saved copy
+    return ModelLoader("microsoft/DialoGPT-small",
+                       quantize=os.environ.get("CHATBOT_QUANTIZE") == "1",
+                       snapshot=os.environ.get("CHATBOT_SNAPSHOT")).start()
+
+model_loader = load_model_loader()
+
 @st.cache_resource
 def load_chatbot():
-    tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-small")
-    model = AutoModelForCausalLM.from_pretrained("microsoft/DialoGPT-small")
-    return tokenizer, model
+    return model_loader.wait()
 
-# ✅ spinner + success instead of "Running load_chatbot()"
-with st.spinner("🤖 Loading chatbot model, please wait..."):
+@st.cache_resource
+def load_chat_engine():
     tokenizer, model = load_chatbot()
-st.success("✅ Chatbot ready!")
+    return ChatEngine(tokenizer, model, window=256, keep_tokens=128, max_new_tokens=64)
+
+@st.cache_resource
+def load_scheduler():
+    # shared by every session: pending replies are batched into one generate pass
+    return BatchScheduler(load_chat_engine(), max_batch_size=8, max_wait_ms=20)
+
+@st.cache_resource
+def load_translator():
+    # TRANSLATOR_BACKEND=stub swaps Google for an offline stand-in
+    return Translator(backend=os.environ.get("TRANSLATOR_BACKEND", "google"),
+                      cache_path=os.path.join(".cache", "translations.sqlite3"))
+
+translator = load_translator()
+
+@st.cache_resource
+def load_recognizer():
+    # SPEECH_BACKEND=stub swaps Google speech recognition for an offline stand-in
+    return StreamingRecognizer(backend=os.environ.get("SPEECH_BACKEND", "google"), language="en-IN")
+
+recognizer = load_recognizer()
+
+@st.cache_resource
+def load_tts():
+    # TTS_BACKEND=pyttsx3 keeps speech synthesis fully offline; Odia always uses the offline voice
+    return TTSEngine(os.path.join(".cache", "tts"), max_bytes=50 * 1024 * 1024,
+                     offline=os.environ.get("TTS_BACKEND") == "pyttsx3")
+
+tts_engine = load_tts()
+
+# ✅ page renders right away; the model keeps loading in the background
+if model_loader.ready():
+    st.success("✅ Chatbot ready!")
+elif model_loader.error is not None:
+    st.error(f"Chatbot model failed to load: {model_loader.error}. Retrying in the background...")
+    model_loader.start()
+else:
+    st.info("🤖 Loading chatbot model in the background...")
 
 # -------------------- STYLES --------------------
 def set_theme(dark=False):
@@ -52,39 +98,51 @@ st.markdown(set_theme(dark_mode), unsafe_allow_html=True)
 st.markdown('<h1 style="text-align:center;">🌍 Multilingual Voice + Chat Sentiment Chatbot</h1>', unsafe_allow_html=True)
 
 # -------------------- SESSION STATE --------------------
-if "sentiment_history" not in st.session_state:
-    st.session_state.sentiment_history = []
-if "chat_history_ids" not in st.session_state:
-    st.session_state.chat_history_ids = None
+if "dashboard" not in st.session_state:
+    st.session_state.dashboard = DashboardState()
+if "chat_state" not in st.session_state:
+    st.session_state.chat_state = ChatState()
 if "reminders" not in st.session_state:
     st.session_state.reminders = []
-if "chat_log" not in st.session_state:
-    st.session_state.chat_log = []
+if "last_timings" not in st.session_state:
+    st.session_state.last_timings = None
 
 # -------------------- FUNCTIONS --------------------
 def chatbot_reply(user_text):
-    new_input_ids = tokenizer.encode(user_text + tokenizer.eos_token, return_tensors="pt")
-    bot_input_ids = torch.cat([st.session_state.chat_history_ids, new_input_ids], dim=-1) if st.session_state.chat_history_ids is not None else new_input_ids
-    st.session_state.chat_history_ids = model.generate(bot_input_ids, max_length=200, pad_token_id=tokenizer.eos_token_id)
-    reply = tokenizer.decode(st.session_state.chat_history_ids[:, bot_input_ids.shape[-1]:][0], skip_special_tokens=True)
-    return reply
+    # KV cache + sliding window live in the session's ChatState, so each turn only encodes new tokens
+    if not model_loader.ready():
+        with st.spinner("🤖 Waiting for the chatbot model to finish loading..."):
+            load_scheduler()
+    return load_scheduler().reply(st.session_state.chat_state, user_text)
 
 def translate_text(text, src="en", dest="en"):
-    if src == dest: return text
-    return GoogleTranslator(source=src, target=dest).translate(text)
+    return translator.translate(text, src=src, dest=dest)
+
+def synthesize_speech(text, lang="en"):
+    return tts_engine.submit(text, lang)
+
+@st.cache_resource
+def load_pipeline_pool():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="message-pipeline")
 
 def process_text(user_text, lang="en"):
-    user_text_en = translate_text(user_text, src=lang, dest="en")
-    polarity = TextBlob(user_text_en).sentiment.polarity
-    reply_en = chatbot_reply(user_text_en)
-    reply = translate_text(reply_en, src="en", dest=lang)
-    return reply, polarity
-
-def speak_text(text):
-    tts = gTTS(text=text, lang="en")
-    audio_bytes = BytesIO()
-    tts.write_to_fp(audio_bytes)
-    st.audio(audio_bytes.getvalue(), format="audio/mp3")
+    # sentiment runs alongside reply generation; TTS starts as soon as the reply text exists.
+    # Only the pool is cached, so edits to the stage functions take effect on the next rerun.
+    pipeline = MessagePipeline(translate_text, score_polarity, chatbot_reply, synthesize_speech,
+                               pool=load_pipeline_pool())
+    result = pipeline.run(user_text, lang=lang)
+    st.session_state.last_timings = result.timings
+    return result
+
+def speak_text(audio):
+    # one player per sentence, rendered as soon as that sentence is ready
+    for chunk in audio:
+        try:
+            chunk = chunk.result()
+        except Exception as e:
+            st.warning(f"Speech synthesis failed: {e}")
+            continue
+        st.audio(chunk.data, format=chunk.mime)
 
 # -------------------- LANG SELECTION --------------------
 lang_choice = st.sidebar.selectbox("🌐 Choose Language", ["English", "Hindi", "Odia"])
@@ -102,14 +160,10 @@ with tab1:
     wav_audio_data = st_audiorec()
     if wav_audio_data is not None and st.button("Analyze Recorded Voice"):
         try:
-            with open("temp.wav", "wb") as f:
-                f.write(wav_audio_data)
-            recognizer = sr.Recognizer()
-            with sr.AudioFile("temp.wav") as source:
-                audio = recognizer.record(source)
-            text = recognizer.recognize_google(audio, language="en-IN")
+            text = recognizer.transcribe(wav_audio_data)
             st.success(f"Recognized: {text}")
-            reply, polarity = process_text(text, lang=user_lang)
+            result = process_text(text, lang=user_lang)
+            reply, polarity = result.reply, result.polarity
 
             if polarity > 0:
                 st.markdown(f"<h3 style='color:green'>😊 Positive ({polarity:.2f})</h3>", unsafe_allow_html=True)
@@ -118,33 +172,36 @@ with tab1:
             else:
                 st.markdown(f"<h3 style='color:orange'>😐 Neutral ({polarity:.2f})</h3>", unsafe_allow_html=True)
 
-            st.session_state.chat_log.append(("You", text))
-            st.session_state.chat_log.append(("Bot", reply))
-            speak_text(reply)
-            st.session_state.sentiment_history.append((datetime.now(), polarity))
+            st.session_state.dashboard.record(text, reply, polarity, datetime.now())
+            speak_text(result.audio)
         except Exception as e:
             st.error(f"Speech recognition failed: {e}")
 
     # File upload
     audio_file = st.file_uploader("Upload voice (wav/mp3)", type=["wav", "mp3"])
     if audio_file and st.button("Analyze Uploaded Voice"):
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_file) as source:
-            audio = recognizer.record(source)
         try:
-            text = recognizer.recognize_google(audio, language="en-IN")
+            # long clips are split on silence; show each chunk's text as soon as it is ready
+            partial, parts = st.empty(), []
+            for part in recognizer.stream(audio_file.getvalue()):
+                if part:
+                    parts.append(part)
+                    partial.info(f"Recognizing: {' '.join(parts)}")
+            partial.empty()
+            if not parts:
+                raise ValueError("no speech recognized")
+            text = " ".join(parts)
             st.success(f"Recognized: {text}")
-            reply, polarity = process_text(text, lang=user_lang)
+            result = process_text(text, lang=user_lang)
+            reply, polarity = result.reply, result.polarity
             if polarity > 0:
                 st.markdown(f"<h3 style='color:green'>😊 Positive ({polarity:.2f})</h3>", unsafe_allow_html=True)
             elif polarity < 0:
                 st.markdown(f"<h3 style='color:red'>😡 Negative ({polarity:.2f})</h3>", unsafe_allow_html=True)
             else:
                 st.markdown(f"<h3 style='color:orange'>😐 Neutral ({polarity:.2f})</h3>", unsafe_allow_html=True)
-            st.session_state.chat_log.append(("You", text))
-            st.session_state.chat_log.append(("Bot", reply))
-            speak_text(reply)
-            st.session_state.sentiment_history.append((datetime.now(), polarity))
+            st.session_state.dashboard.record(text, reply, polarity, datetime.now())
+            speak_text(result.audio)
         except Exception as e:
             st.error(f"Speech recognition failed: {e}")
 
@@ -154,58 +211,45 @@ with tab2:
     chat_input = st.text_input("Type your message")
     if st.button("Send"):
         if chat_input:
-            reply, polarity = process_text(chat_input, lang=user_lang)
+            result = process_text(chat_input, lang=user_lang)
+            reply, polarity = result.reply, result.polarity
             if polarity > 0:
                 st.markdown(f"<h3 style='color:green'>😊 Positive ({polarity:.2f})</h3>", unsafe_allow_html=True)
             elif polarity < 0:
                 st.markdown(f"<h3 style='color:red'>😡 Negative ({polarity:.2f})</h3>", unsafe_allow_html=True)
             else:
                 st.markdown(f"<h3 style='color:orange'>😐 Neutral ({polarity:.2f})</h3>", unsafe_allow_html=True)
-            st.session_state.chat_log.append(("You", chat_input))
-            st.session_state.chat_log.append(("Bot", reply))
-            speak_text(reply)
-            st.session_state.sentiment_history.append((datetime.now(), polarity))
+            st.session_state.dashboard.record(chat_input, reply, polarity, datetime.now())
+            speak_text(result.audio)
         else:
             st.warning("Please type a message.")
 
+# -------------------- DASHBOARD --------------------
+dashboard = st.session_state.dashboard
+profiler = PanelProfiler(enabled=st.sidebar.checkbox("⏱ Profile panels"))
+
 # -------------------- CHAT LOG --------------------
-if st.session_state.chat_log:
-    st.markdown('<div class="card"><h2>💬 Conversation</h2></div>', unsafe_allow_html=True)
-    for sender, msg in st.session_state.chat_log:
-        if sender == "You":
-            st.markdown(f"<div class='user-bubble'>{msg}</div>", unsafe_allow_html=True)
-        else:
-            st.markdown(f"<div class='bot-bubble'>{msg}</div>", unsafe_allow_html=True)
+if dashboard.chat_log:
+    with profiler.panel("chat_log"):
+        st.markdown('<div class="card"><h2>💬 Conversation</h2></div>', unsafe_allow_html=True)
+        st.markdown(dashboard.chat_html(), unsafe_allow_html=True)
 
 # -------------------- SENTIMENT TREND --------------------
-if len(st.session_state.sentiment_history) > 1:
-    st.markdown('<div class="card"><h2>📊 Sentiment Trend</h2></div>', unsafe_allow_html=True)
-    times, polarities = zip(*st.session_state.sentiment_history)
-    plt.figure(figsize=(8, 3))
-    colors = ['green' if p > 0 else 'red' if p < 0 else 'orange' for p in polarities]
-    plt.plot(times, polarities, marker='o', linestyle='-', color='#ff7f50')
-    plt.scatter(times, polarities, color=colors, s=100)
-    plt.axhline(y=0, color='gray', linestyle='--')
-    plt.xlabel("Time")
-    plt.ylabel("Polarity")
-    plt.title("Sentiment Trend Over Time")
-    plt.xticks(rotation=30)
-    st.pyplot(plt)
-
-    # ⬇️ Export CSV
-    df = pd.DataFrame(st.session_state.sentiment_history, columns=["time", "polarity"])
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button("⬇️ Download Sentiment History", csv, "sentiment_history.csv", "text/csv")
+if len(dashboard.polarities) > 1:
+    with profiler.panel("sentiment_trend"):
+        st.markdown('<div class="card"><h2>📊 Sentiment Trend</h2></div>', unsafe_allow_html=True)
+        st.line_chart(dashboard.trend(), y="polarity", color="#ff7f50")
+
+        # ⬇️ Export CSV
+        st.download_button("⬇️ Download Sentiment History", dashboard.csv(), "sentiment_history.csv", "text/csv")
 
 # -------------------- WORD CLOUD --------------------
-if st.session_state.chat_log:
-    st.markdown('<div class="card"><h2>☁️ Word Cloud</h2></div>', unsafe_allow_html=True)
-    all_text = " ".join([msg for sender, msg in st.session_state.chat_log if sender == "You"])
-    if all_text.strip():
-        wordcloud = WordCloud(width=600, height=300, background_color="white").generate(all_text)
-        plt.imshow(wordcloud, interpolation="bilinear")
-        plt.axis("off")
-        st.pyplot(plt)
+if dashboard.chat_log:
+    with profiler.panel("word_cloud"):
+        st.markdown('<div class="card"><h2>☁️ Word Cloud</h2></div>', unsafe_allow_html=True)
+        image = dashboard.wordcloud_image()
+        if image is not None:
+            st.image(image, use_column_width=True)
 
 # -------------------- REMINDERS --------------------
 st.markdown('<div class="card"><h2>⏰ Reminders</h2></div>', unsafe_allow_html=True)
@@ -221,6 +265,25 @@ if st.session_state.reminders:
     for t, r in st.session_state.reminders:
         st.markdown(f"- [{t}] {r}")
 
+# -------------------- STATS --------------------
+# rendered after the tabs so they include the message sent on this run
+with st.sidebar.expander("📈 Chatbot server stats"):
+    if model_loader.ready():
+        st.json(load_scheduler().stats())
+with st.sidebar.expander("🚀 Startup timings (ms)"):
+    st.json(model_loader.timings())
+with st.sidebar.expander("🌐 Translation cache stats"):
+    st.json(translator.stats())
+with st.sidebar.expander("🔊 Speech cache stats"):
+    st.json(tts_engine.stats())
+with st.sidebar.expander("⏱ Last message timings (ms)"):
+    if st.session_state.last_timings is not None:
+        st.json(st.session_state.last_timings.as_dict())
+
+if profiler.enabled:
+    with st.sidebar.expander("⏱ Panel render times (ms)", expanded=True):
+        st.json(profiler.timings)
+
 # -------------------- FOOTER --------------------
 st.markdown("---")
 st.markdown("<p style='text-align:center;'>✨ Super-Polished Multilingual AI Chatbot | Python + Streamlit</p>", unsafe_allow_html=True)
@@ -0,0 +1,169 @@
+"""Headless batch scoring for transcript and audio corpora.
+
+    python batch.py corpus.jsonl out/ --workers 4 --lang hi
+    python batch.py recordings/ out/ --speech-backend google
+
+Input is a JSONL file (one {"id", "text", "lang"} object per line), a CSV with the same
+columns, or a directory of WAV files. Records are scored in fixed-size batches on a process
+pool; every batch is written as its own Parquet part file and the checkpoint is updated
+afterwards, so an interrupted run resumes from the last finished batch.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from itertools import islice
+from multiprocessing import Pool
+
+from sentiment import score_polarities
+from speech import StreamingRecognizer
+from translation import Translator
+
+CHECKPOINT = "_checkpoint.json"
+COLUMNS = ["id", "source", "lang", "text", "text_en", "polarity", "error"]
+
+
+# -------------------- READERS --------------------
+def iter_records(path, lang="en"):
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(".wav"):
+                yield {"id": name, "audio": os.path.join(path, name), "lang": lang}
+    elif path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                yield {"id": row.get("id") or str(i), "text": row["text"], "lang": row.get("lang") or lang}
+    else:
+        with open(path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if line.strip():
+                    row = json.loads(line)
+                    yield {"id": str(row.get("id", i)), "text": row["text"], "lang": row.get("lang") or lang}
+
+
+# -------------------- WORKER --------------------
+_translator = None
+_recognizer = None
+
+
+def _init_worker(translator_backend, speech_backend, cache_path):
+    global _translator, _recognizer
+    _translator = Translator(backend=translator_backend, cache_path=cache_path)
+    _recognizer = StreamingRecognizer(backend=speech_backend, max_workers=1)
+
+
+def score_record(record):
+    """Transcribe and translate one record; polarity is filled in per chunk by ``score_chunk``."""
+    result = {"id": record["id"], "source": record.get("audio", "text"), "lang": record["lang"],
+              "text": record.get("text"), "text_en": None, "polarity": None, "error": None}
+    try:
+        if "audio" in record:
+            with open(record["audio"], "rb") as f:
+                result["text"] = _recognizer.transcribe(f.read())
+        result["text_en"] = _translator.translate(result["text"], src=record["lang"], dest="en")
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def score_chunk(records):
+    rows = [score_record(record) for record in records]
+    # one vectorized sentiment pass per chunk instead of one per message
+    ok = [row for row in rows if row["error"] is None]
+    try:
+        for row, polarity in zip(ok, score_polarities([row["text_en"] for row in ok])):
+            row["polarity"] = float(polarity)
+    except Exception as e:
+        for row in ok:
+            row["error"] = f"{type(e).__name__}: {e}"
+    return rows
+
+
+# -------------------- CHECKPOINT / OUTPUT --------------------
+def load_checkpoint(output_dir):
+    path = os.path.join(output_dir, CHECKPOINT)
+    if not os.path.exists(path):
+        return {"records": 0, "parts": 0}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(output_dir, checkpoint):
+    path = os.path.join(output_dir, CHECKPOINT)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def write_part(output_dir, part, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pylist(rows, schema=pa.schema([
+        ("id", pa.string()), ("source", pa.string()), ("lang", pa.string()), ("text", pa.string()),
+        ("text_en", pa.string()), ("polarity", pa.float64()), ("error", pa.string())]))
+    path = os.path.join(output_dir, f"part-{part:05d}.parquet")
+    pq.write_table(table, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+# -------------------- RUN --------------------
+def run(input_path, output_dir, workers=None, batch_size=1000, lang="en",
+        translator_backend="google", speech_backend="google", cache_path=None, resume=True):
+    os.makedirs(output_dir, exist_ok=True)
+    if resume:
+        checkpoint = load_checkpoint(output_dir)
+    else:
+        # reset the checkpoint before dropping parts, so an interrupted restart never skips records
+        checkpoint = {"records": 0, "parts": 0}
+        save_checkpoint(output_dir, checkpoint)
+        for name in os.listdir(output_dir):
+            if name.startswith("part-") and name.endswith(".parquet"):
+                os.remove(os.path.join(output_dir, name))
+    records = islice(iter_records(input_path, lang), checkpoint["records"], None)
+    workers = workers or os.cpu_count()
+
+    done, start = 0, time.perf_counter()
+    with Pool(workers, initializer=_init_worker,
+              initargs=(translator_backend, speech_backend, cache_path)) as pool:
+        # only one batch is held in memory at a time
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            size = max(len(batch) // (workers * 4), 1)
+            chunks = [batch[i:i + size] for i in range(0, len(batch), size)]
+            rows = [row for chunk in pool.map(score_chunk, chunks, chunksize=1) for row in chunk]
+            write_part(output_dir, checkpoint["parts"], rows)
+            checkpoint["records"] += len(rows)
+            checkpoint["parts"] += 1
+            save_checkpoint(output_dir, checkpoint)
+            done += len(rows)
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    return {"records": done, "total_records": checkpoint["records"], "seconds": round(elapsed, 3),
+            "workers": workers, "messages_per_second": rate, "messages_per_second_per_core": rate / workers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL/CSV file or directory of WAV files")
+    parser.add_argument("output", help="directory for Parquet part files and the checkpoint")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--lang", default="en", help="source language for records without one")
+    parser.add_argument("--translator", default="google", choices=["google", "stub"])
+    parser.add_argument("--speech-backend", default="google", choices=["google", "stub"])
+    parser.add_argument("--cache", default=os.path.join(".cache", "translations.sqlite3"))
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    stats = run(args.input, args.output, args.workers, args.batch_size, args.lang,
+                args.translator, args.speech_backend, args.cache, resume=not args.restart)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Batch scoring throughput (messages/s and messages/s per core) on a synthetic corpus.
+
+Uses the stub translator so the numbers reflect local work, not Google round-trips.
+
+    python benchmarks/bench_batch_throughput.py --messages 20000 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch
+
+WORDS = ["good", "bad", "happy", "terrible", "not", "very", "really", "movie", "day", "work",
+         "great", "awful", "love", "hate", "the", "was", "is", "a", "friend", "food"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.jsonl")
+        with open(corpus, "w", encoding="utf-8") as f:
+            for i in range(args.messages):
+                text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 15)))
+                f.write(json.dumps({"id": i, "text": text, "lang": "en"}) + "\n")
+
+        print(f"{'workers':>8} {'msg/s':>10} {'msg/s/core':>11}")
+        for workers in args.workers:
+            stats = batch.run(corpus, os.path.join(tmp, f"out-{workers}"), workers=workers,
+                              batch_size=args.batch_size, translator_backend="stub", speech_backend="stub")
+            print(f"{workers:>8} {stats['messages_per_second']:>10.0f} {stats['messages_per_second_per_core']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
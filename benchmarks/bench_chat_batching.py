@@ -0,0 +1,57 @@
+"""Reply throughput with many concurrent sessions, for several scheduler batch sizes.
+
+    python benchmarks/bench_chat_batching.py --sessions 16 --batch-sizes 1 4 8 16
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from chat_engine import ChatEngine, ChatState
+from chat_server import BatchScheduler
+
+MESSAGES = ["Hi there!", "How are you doing today?", "What do you like to do for fun?",
+            "I had a really long day at work.", "Can you recommend a good movie?"]
+
+
+def session(scheduler, turns):
+    state = ChatState()
+    for turn in range(turns):
+        scheduler.reply(state, MESSAGES[turn % len(MESSAGES)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="microsoft/DialoGPT-small")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=20)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForCausalLM.from_pretrained(args.model).eval()
+    torch.set_grad_enabled(False)
+    engine = ChatEngine(tokenizer, model, max_new_tokens=args.max_new_tokens)
+
+    print(f"{'batch':>6} {'replies/s':>10} {'mean batch':>11}")
+    for size in args.batch_sizes:
+        scheduler = BatchScheduler(engine, max_batch_size=size, max_wait_ms=args.max_wait_ms)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.sessions) as pool:
+            for f in [pool.submit(session, scheduler, args.turns) for _ in range(args.sessions)]:
+                f.result()
+        elapsed = time.perf_counter() - start
+        stats = scheduler.stats()
+        print(f"{size:>6} {stats['requests'] / elapsed:>10.2f} {stats['mean_batch_size']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
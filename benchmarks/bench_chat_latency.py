@@ -0,0 +1,66 @@
+"""Per-turn reply latency vs. conversation length: full-history ``generate`` vs. ChatEngine.
+
+    python benchmarks/bench_chat_latency.py --turns 40
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from chat_engine import ChatEngine, ChatState
+
+MESSAGES = ["Hi there!", "How are you doing today?", "What do you like to do for fun?",
+            "I had a really long day at work.", "Can you recommend a good movie?",
+            "Tell me something interesting."]
+
+
+def full_history(tokenizer, model, max_new_tokens):
+    history = None
+
+    def reply(text):
+        nonlocal history
+        new_ids = tokenizer.encode(text + tokenizer.eos_token, return_tensors="pt")
+        inputs = torch.cat([history, new_ids], dim=-1) if history is not None else new_ids
+        history = model.generate(inputs, max_new_tokens=max_new_tokens, pad_token_id=tokenizer.eos_token_id)
+        return tokenizer.decode(history[0, inputs.shape[-1]:], skip_special_tokens=True)
+    return reply
+
+
+def run(name, reply, turns):
+    print(f"\n{name}")
+    print(f"{'turn':>5} {'ms':>9}")
+    total = 0.0
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        reply(MESSAGES[turn % len(MESSAGES)])
+        elapsed = (time.perf_counter() - start) * 1000
+        total += elapsed
+        if turn == 1 or turn % 5 == 0:
+            print(f"{turn:>5} {elapsed:>9.1f}")
+    print(f"mean {total / turns:.1f} ms/turn")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="microsoft/DialoGPT-small")
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForCausalLM.from_pretrained(args.model).eval()
+    torch.set_grad_enabled(False)
+
+    run("full history + generate", full_history(tokenizer, model, args.max_new_tokens), args.turns)
+    engine = ChatEngine(tokenizer, model, max_new_tokens=args.max_new_tokens)
+    state = ChatState()
+    run("ChatEngine (KV cache, sliding window)", lambda text: engine.reply(state, text), args.turns)
+
+
+if __name__ == "__main__":
+    main()
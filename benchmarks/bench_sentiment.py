@@ -0,0 +1,83 @@
+"""SentimentEngine vs. per-message TextBlob at 1, 1k and 1M messages.
+
+Checks polarity parity with TextBlob on a randomized corpus before timing anything.
+Each size is timed twice: with all-distinct messages (pure scoring speed) and with messages
+drawn from a pool of --pool distinct strings (chat-like repetition, where the engine also
+benefits from scoring duplicates once). TextBlob at 1M messages takes minutes; pass
+--textblob-max to extrapolate above a size; --parity-only stops after the parity check.
+
+    python benchmarks/bench_sentiment.py --sizes 1 1000 1000000 --textblob-max 100000
+    python benchmarks/bench_sentiment.py --parity-only
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textblob import TextBlob
+from textblob.en import sentiment as lexicon
+
+from sentiment import SentimentEngine
+
+EXTRA = ["not", "never", "no", "n't", "very", "really", "extremely", "terribly", "!", "(!)",
+         ":)", ":-(", ":D", "<3", "a", "is", "the", "don't", "isn't", "...", "?", "xD", ":P"]
+
+
+def corpus(size, seed=0, vocab_size=None):
+    rng = random.Random(seed)
+    words = sorted(lexicon.keys())
+    messages = []
+    for _ in range(size):
+        tokens = [rng.choice(words if rng.random() < 0.6 else EXTRA) for _ in range(rng.randint(1, 15))]
+        messages.append(" ".join(tokens) + rng.choice(["", "!", ".", " :)"]))
+    # chat traffic repeats itself; draw from a bounded pool of distinct messages
+    pool = messages[:vocab_size]
+    return [rng.choice(pool) for _ in range(size)] if vocab_size and size > vocab_size else messages
+
+
+def check_parity(engine, size=20000):
+    texts = corpus(size, seed=1)
+    got = engine.polarities(texts)
+    mismatches = [t for t, p in zip(texts, got) if p != TextBlob(t).sentiment.polarity]
+    if mismatches:
+        raise SystemExit(f"parity check failed on {len(mismatches)} messages, e.g. {mismatches[0]!r}")
+    print(f"parity: {size} messages identical to TextBlob")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 1000000])
+    parser.add_argument("--textblob-max", type=int, default=None)
+    parser.add_argument("--pool", type=int, default=5000)
+    parser.add_argument("--parity-only", action="store_true", help="check TextBlob parity, skip timing")
+    args = parser.parse_args()
+
+    engine = SentimentEngine()
+    check_parity(engine)
+    if args.parity_only:
+        return
+
+    print(f"{'messages':>9} {'corpus':>9} {'textblob s':>11} {'engine s':>9} {'speedup':>8}")
+    for size in args.sizes:
+        for label, pool in [("distinct", None), ("repeated", args.pool)]:
+            if pool and size <= pool:
+                continue
+            texts = corpus(size, vocab_size=pool)
+            sample = texts if args.textblob_max is None else texts[:args.textblob_max]
+            start = time.perf_counter()
+            for text in sample:
+                TextBlob(text).sentiment.polarity
+            textblob_s = (time.perf_counter() - start) * len(texts) / len(sample)
+
+            start = time.perf_counter()
+            engine.polarities(texts)
+            engine_s = time.perf_counter() - start
+            note = "*" if len(sample) < len(texts) else ""
+            print(f"{size:>9} {label:>9} {textblob_s:>10.3f}{note:1} {engine_s:>9.3f} {textblob_s / engine_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
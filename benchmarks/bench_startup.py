@@ -0,0 +1,92 @@
+"""Cold-start costs: time-to-first-paint, time-to-first-reply and memory footprint.
+
+Every measurement runs in a fresh interpreter so import caches and allocator state do not leak
+between variants.
+
+  * first paint: importing what app.py needs before it can render (lazy) vs. the old eager
+    top-level imports (torch, transformers, matplotlib, pandas, wordcloud, ...)
+  * first reply: ModelLoader + ChatEngine for fp32, dynamic int8, and an int8 snapshot
+  * memory: peak RSS of the process after the first reply
+
+    python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LAZY_IMPORTS = ["streamlit", "chat_engine", "chat_server", "translation", "pipeline", "speech",
+                "sentiment", "tts", "dashboard", "model_loader"]
+EAGER_IMPORTS = ["streamlit", "speech_recognition", "textblob", "matplotlib.pyplot", "pandas",
+                 "deep_translator", "gtts", "transformers", "torch", "wordcloud"]
+
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def child_imports(modules):
+    start = time.perf_counter()
+    for module in modules:
+        __import__(module)
+    return {"ms": (time.perf_counter() - start) * 1000, "peak_rss_mb": peak_rss_mb()}
+
+
+def child_reply(model, quantize, snapshot):
+    from chat_engine import ChatEngine, ChatState
+    from model_loader import ModelLoader
+
+    start = time.perf_counter()
+    loader = ModelLoader(model, quantize=quantize, snapshot=snapshot).start()
+    tokenizer, lm = loader.wait()
+    ChatEngine(tokenizer, lm).reply(ChatState(), "Hi there, how are you?")
+    return {"ms": (time.perf_counter() - start) * 1000, "peak_rss_mb": peak_rss_mb(), "steps": loader.timings()}
+
+
+def run_child(model, *args):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--model", model, "--child", *args],
+                         capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="microsoft/DialoGPT-small")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, *rest = args.child
+        if kind == "imports":
+            result = child_imports(rest)
+        else:
+            quantize, snapshot = rest[0] == "int8", rest[1] if len(rest) > 1 else None
+            result = child_reply(args.model, quantize, snapshot)
+        print(json.dumps(result))
+        return
+
+    print(f"{'first paint':<28} {'ms':>9} {'peak MB':>9}")
+    for name, modules in [("eager imports (before)", EAGER_IMPORTS), ("lazy imports (app.py)", LAZY_IMPORTS)]:
+        r = run_child(args.model, "imports", *modules)
+        print(f"{name:<28} {r['ms']:>9.0f} {r['peak_rss_mb']:>9.0f}")
+
+    print(f"\n{'first reply':<28} {'ms':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as snapshot:
+        variants = [("fp32", ["fp32"]), ("int8", ["int8"]),
+                    ("int8 snapshot (save)", ["int8", snapshot]),
+                    ("int8 snapshot (load)", ["int8", snapshot])]
+        for name, child_args in variants:
+            r = run_child(args.model, "reply", *child_args)
+            print(f"{name:<28} {r['ms']:>9.0f} {r['peak_rss_mb']:>9.0f}   {r['steps']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -------------------- SESSION STATE --------------------
+class ChatState:
+    """Per-session conversation: token ids in the window plus the KV cache covering a prefix of them."""
+
+    def __init__(self):
+        self.ids = []          # token ids kept in the sliding window
+        self.past = None       # legacy KV cache tuple covering ids[:past_len]
+        self.past_len = 0
+        self.turns = 0
+
+    def reset_cache(self):
+        self.past = None
+        self.past_len = 0
+
+
+# -------------------- ENGINE --------------------
+class ChatEngine:
+    """Incremental greedy decoding for DialoGPT that reuses ``past_key_values`` between turns.
+
+    Each turn only feeds the tokens the cache has not seen yet, so per-turn cost does not grow
+    with the conversation. When the window would overflow, the history is trimmed back to
+    ``keep_tokens`` (on a turn boundary) and re-encoded once.
+    """
+
+    def __init__(self, tokenizer, model, window=256, keep_tokens=128, max_new_tokens=64):
+        if keep_tokens + max_new_tokens >= window:
+            raise ValueError("keep_tokens + max_new_tokens must be smaller than window")
+        self.tokenizer = tokenizer
+        self.model = model
+        self.window = min(window, getattr(model.config, "n_positions", window))
+        self.keep_tokens = keep_tokens
+        self.max_new_tokens = max_new_tokens
+        self.eos_id = tokenizer.eos_token_id
+
+    def reply(self, state, user_text):
+        return self.reply_batch([state], [user_text])[0]
+
+    def reply_batch(self, states, texts):
+        """Generate one reply per (state, text) pair in a single padded forward pass per step."""
+        import torch
+        # a failed decode must not leave a user turn without its reply in the history
+        saved = [(s.ids, s.past, s.past_len) for s in states]
+        feeds = []
+        for state, text in zip(states, texts):
+            new_ids = self.tokenizer.encode(text + self.tokenizer.eos_token)
+            new_ids = new_ids[-(self.window - self.max_new_tokens):]
+            self._trim(state, len(new_ids))
+            state.ids = state.ids + new_ids
+            feeds.append(state.ids[state.past_len:])
+
+        try:
+            with torch.no_grad():
+                generated, past, mask = self._decode(states, feeds)
+        except Exception:
+            for state, (ids, past, past_len) in zip(states, saved):
+                state.ids, state.past, state.past_len = ids, past, past_len
+            raise
+
+        replies = []
+        for row, (state, tokens) in enumerate(zip(states, generated)):
+            keep = mask[row].nonzero(as_tuple=True)[0]
+            state.past = tuple((k[row:row + 1, :, keep], v[row:row + 1, :, keep]) for k, v in past)
+            state.past_len = keep.numel()
+            state.ids.extend(tokens)
+            if not tokens or tokens[-1] != self.eos_id:
+                state.ids.append(self.eos_id)   # keep the turn separator DialoGPT expects
+            state.turns += 1
+            replies.append(self.tokenizer.decode(tokens, skip_special_tokens=True))
+        return replies
+
+    def _trim(self, state, incoming):
+        if len(state.ids) + incoming + self.max_new_tokens <= self.window:
+            return
+        budget = max(self.keep_tokens - incoming, 0)
+        tail = state.ids[len(state.ids) - budget:] if budget else []
+        # start the kept history right after a turn separator so the context stays well-formed
+        if self.eos_id in tail:
+            tail = tail[tail.index(self.eos_id) + 1:]
+        state.ids = tail
+        state.reset_cache()
+
+    def _decode(self, states, feeds):
+        """Greedy decode for a batch of sessions whose caches and new inputs have different lengths.
+
+        Caches and feeds are left-padded to a common length; padded slots are masked out and
+        position ids are derived from the mask, so every row sees exactly its own history.
+        """
+        import torch
+        batch = len(states)
+        cache_len = max(s.past_len for s in states)
+        feed_len = max(len(f) for f in feeds)
+
+        mask = torch.zeros(batch, cache_len + feed_len, dtype=torch.long)
+        input_ids = torch.full((batch, feed_len), self.eos_id, dtype=torch.long)
+        for row, (state, feed) in enumerate(zip(states, feeds)):
+            mask[row, cache_len - state.past_len:cache_len] = 1
+            mask[row, cache_len + feed_len - len(feed):] = 1
+            input_ids[row, feed_len - len(feed):] = torch.tensor(feed, dtype=torch.long)
+        past = self._pad_past(states, cache_len) if cache_len else None
+
+        generated = [[] for _ in range(batch)]
+        done = torch.zeros(batch, dtype=torch.bool)
+        for step in range(self.max_new_tokens):
+            positions = (mask.cumsum(-1) - 1).clamp(min=0)[:, -input_ids.shape[1]:]
+            out = self.model(input_ids=input_ids, past_key_values=past, attention_mask=mask,
+                             position_ids=positions, use_cache=True)
+            past = self._legacy(out.past_key_values)
+            next_ids = out.logits[:, -1, :].argmax(dim=-1)
+            for row in range(batch):
+                if not done[row]:
+                    generated[row].append(int(next_ids[row]))
+            active = ~done
+            done = done | (next_ids == self.eos_id)
+            if done.all() or step == self.max_new_tokens - 1:
+                break
+            # rows that already finished keep stepping, but their slots stay masked out
+            input_ids = next_ids.unsqueeze(-1)
+            mask = torch.cat([mask, active.long().unsqueeze(-1)], dim=-1)
+        return generated, past, mask
+
+    def _pad_past(self, states, cache_len):
+        import torch
+        template = next(s.past for s in states if s.past is not None)
+        layers = []
+        for layer, (k0, v0) in enumerate(template):
+            keys, values = [], []
+            for state in states:
+                if state.past is None:
+                    k = k0.new_zeros(k0.shape[:2] + (0,) + k0.shape[3:])
+                    v = v0.new_zeros(v0.shape[:2] + (0,) + v0.shape[3:])
+                else:
+                    k, v = state.past[layer]
+                pad = cache_len - k.shape[2]
+                keys.append(torch.nn.functional.pad(k, (0, 0, pad, 0)))
+                values.append(torch.nn.functional.pad(v, (0, 0, pad, 0)))
+            layers.append((torch.cat(keys), torch.cat(values)))
+        return tuple(layers)
+
+    @staticmethod
+    def _legacy(past):
+        return past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
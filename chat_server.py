@@ -0,0 +1,105 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+
+# -------------------- METRICS --------------------
+class SchedulerMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = Counter()     # batch size -> number of batches
+        self.busy_seconds = 0.0
+
+    def record(self, size, seconds):
+        with self._lock:
+            self.requests += size
+            self.batches += 1
+            self.batch_sizes[size] += 1
+            self.busy_seconds += seconds
+
+    def snapshot(self, queue_depth):
+        with self._lock:
+            return {
+                "queue_depth": queue_depth,
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "batch_sizes": dict(self.batch_sizes),
+                "busy_seconds": round(self.busy_seconds, 3),
+            }
+
+
+# -------------------- SCHEDULER --------------------
+class BatchScheduler:
+    """Collects reply requests from every Streamlit session and runs them as one batched decode.
+
+    A single worker thread owns the model: it waits for the first request, keeps collecting for
+    up to ``max_wait_ms`` (or until ``max_batch_size`` requests are pending) and then calls
+    ``engine.reply_batch``. Callers get a ``Future`` back.
+    """
+
+    def __init__(self, engine, max_batch_size=8, max_wait_ms=20):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = SchedulerMetrics()
+        self._queue = queue.Queue()
+        self._deferred = []
+        self._worker = threading.Thread(target=self._run, name="chat-batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, state, user_text):
+        future = Future()
+        self._queue.put((state, user_text, future))
+        return future
+
+    def reply(self, state, user_text, timeout=None):
+        return self.submit(state, user_text).result(timeout)
+
+    def stats(self):
+        return self.metrics.snapshot(self._queue.qsize() + len(self._deferred))
+
+    def _collect(self):
+        pending, self._deferred = self._deferred, []
+        if not pending:
+            pending.append(self._queue.get())
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # one turn per session per batch; a second message from the same session waits for the next one
+        batch, seen = [], set()
+        for item in pending:
+            if id(item[0]) in seen or len(batch) == self.max_batch_size:
+                self._deferred.append(item)
+            else:
+                seen.add(id(item[0]))
+                batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                replies = self.engine.reply_batch([s for s, _, _ in batch], [t for _, t, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, _, future), reply in zip(batch, replies):
+                    future.set_result(reply)
+            self.metrics.record(len(batch), time.perf_counter() - start)
@@ -0,0 +1,114 @@
+import re
+import time
+from contextlib import contextmanager
+
+
+# -------------------- STATE --------------------
+class DashboardState:
+    """Append-only conversation history with panels derived incrementally from it.
+
+    ``record`` updates every running aggregate (polarity series, CSV rows, chat HTML, word
+    tokens) with just the new message and bumps ``version``; derived artifacts (CSV bytes,
+    chart frame, word counts, word cloud image) are memoized on that version, so a rerun
+    without a new message reuses them as-is. Word counts merge plurals, case variants and
+    collocations over the whole history, as ``WordCloud.generate`` on all messages would.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.chat_log = []              # (sender, message)
+        self.times = []
+        self.polarities = []
+        self.words = []                 # WordCloud tokens of every user message, in order
+        self._csv_rows = ["time,polarity\n"]
+        self._bubbles = []
+        self._wordcloud = None
+        self._memo = {}
+
+    def record(self, user_text, reply, polarity, when):
+        self.chat_log.append(("You", user_text))
+        self.chat_log.append(("Bot", reply))
+        self._bubbles.append(f"<div class='user-bubble'>{user_text}</div>")
+        self._bubbles.append(f"<div class='bot-bubble'>{reply}</div>")
+        self.times.append(when)
+        self.polarities.append(polarity)
+        self._csv_rows.append(f"{when},{polarity}\n")
+        self.words.extend(self._tokens(user_text))
+        self.version += 1
+
+    def _cloud(self):
+        if self._wordcloud is None:
+            from wordcloud import WordCloud
+            self._wordcloud = WordCloud(width=600, height=300, background_color="white")
+        return self._wordcloud
+
+    def _tokens(self, text):
+        """The per-token half of ``WordCloud.process_text``; tokens never span messages."""
+        wc = self._cloud()
+        pattern = wc.regexp
+        if pattern is None:
+            pattern = r"\w[\w']*" if wc.min_word_length <= 1 else r"\w[\w']+"
+        words = [w[:-2] if w.lower().endswith("'s") else w for w in re.findall(pattern, text)]
+        if not wc.include_numbers:
+            words = [w for w in words if not w.isdigit()]
+        if wc.min_word_length:
+            words = [w for w in words if len(w) >= wc.min_word_length]
+        return words
+
+    def _memoized(self, name, build):
+        version, value = self._memo.get(name, (None, None))
+        if version != self.version:
+            value = build()
+            self._memo[name] = (self.version, value)
+        return value
+
+    def chat_html(self):
+        return self._memoized("chat_html", lambda: "".join(self._bubbles))
+
+    def csv(self):
+        return self._memoized("csv", lambda: "".join(self._csv_rows).encode("utf-8"))
+
+    def trend(self):
+        def build():
+            import pandas as pd
+            return pd.DataFrame({"polarity": self.polarities}, index=pd.Index(self.times, name="time"))
+        return self._memoized("trend", build)
+
+    def word_counts(self):
+        """The whole-history half of ``WordCloud.process_text``: stopwords, plurals, collocations."""
+        def build():
+            from wordcloud.tokenization import process_tokens, unigrams_and_bigrams
+            wc = self._cloud()
+            stopwords = {w.lower() for w in wc.stopwords}
+            if wc.collocations:
+                return unigrams_and_bigrams(self.words, stopwords, wc.normalize_plurals,
+                                            wc.collocation_threshold)
+            return process_tokens([w for w in self.words if w.lower() not in stopwords],
+                                  wc.normalize_plurals)[0]
+        return self._memoized("word_counts", build)
+
+    def wordcloud_image(self):
+        def build():
+            counts = self.word_counts()
+            if not counts:
+                return None
+            return self._cloud().generate_from_frequencies(counts).to_array()
+        return self._memoized("wordcloud", build)
+
+
+# -------------------- PROFILING --------------------
+class PanelProfiler:
+    """Wall-clock render time per dashboard panel for the current rerun."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timings = {}
+
+    @contextmanager
+    def panel(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
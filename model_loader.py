@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+DEFAULT_MODEL = "microsoft/DialoGPT-small"
+
+
+# -------------------- QUANTIZATION --------------------
+def conv1d_to_linear(model):
+    """GPT-2 projections are transformers ``Conv1D``; swap them for ``nn.Linear`` so they can be quantized."""
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if isinstance(child, Conv1D):
+                n_in, n_out = child.weight.shape
+                linear = torch.nn.Linear(n_in, n_out)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(module, name, linear)
+    return model
+
+
+def quantize_dynamic_int8(model):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(conv1d_to_linear(model), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# -------------------- LOADER --------------------
+class ModelLoader:
+    """Loads the chatbot model on a background thread so the UI can render meanwhile.
+
+    With ``snapshot`` set, the prepared model is saved there after the first load (one file
+    per precision, plus the tokenizer) and read back directly on later starts. ``timings()``
+    returns milliseconds for every step, including a warm-up forward pass. After a failed
+    load, ``start()`` / ``wait()`` try again.
+    """
+
+    def __init__(self, name=DEFAULT_MODEL, quantize=False, snapshot=None):
+        self.name = name
+        self.quantize = quantize
+        self.snapshot = snapshot
+        self.error = None
+        self._timings = {}
+        self._result = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._created = time.perf_counter()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            failed = self._done.is_set() and self.error is not None
+            if self._thread is None or failed:
+                if failed:
+                    self.error = None
+                    self._timings = {}
+                    self._created = time.perf_counter()
+                    self._done.clear()
+                self._thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+                self._thread.start()
+        return self
+
+    def ready(self):
+        return self._done.is_set() and self.error is None
+
+    def timings(self):
+        with self._lock:
+            return dict(self._timings)
+
+    def wait(self, timeout=None):
+        self.start()
+        while True:
+            if not self._done.wait(timeout):
+                raise TimeoutError(f"{self.name} is still loading")
+            with self._lock:     # a concurrent retry may have cleared _done again
+                if self._done.is_set():
+                    error, result = self.error, self._result
+                    break
+        if error is not None:
+            raise error
+        return result
+
+    def _record(self, name, start):
+        with self._lock:
+            self._timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def _step(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self._record(name, start)
+        return result
+
+    def _run(self):
+        try:
+            self._result = self._load()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._record("total", self._created)
+            self._done.set()
+
+    def _load(self):
+        torch = self._step("import_torch", __import__, "torch")
+        transformers = self._step("import_transformers", __import__, "transformers")
+        model_file = None
+        if self.snapshot:
+            model_file = os.path.join(self.snapshot, "model-int8.pt" if self.quantize else "model-fp32.pt")
+
+        model = None
+        if model_file and os.path.exists(model_file):
+            try:
+                tokenizer = self._step("tokenizer", transformers.AutoTokenizer.from_pretrained, self.snapshot)
+                model = self._step("snapshot_load", torch.load, model_file, weights_only=False)
+            except Exception:
+                model = None    # unreadable snapshot: rebuild it from the hub copy below
+        if model is None:
+            tokenizer = self._step("tokenizer", transformers.AutoTokenizer.from_pretrained, self.name)
+            model = self._step("from_pretrained", transformers.AutoModelForCausalLM.from_pretrained, self.name)
+            if self.quantize:
+                model = self._step("quantize", quantize_dynamic_int8, model)
+            if model_file:
+                os.makedirs(self.snapshot, exist_ok=True)
+                tokenizer.save_pretrained(self.snapshot)
+                # the model file appears last and atomically, so its presence means a complete snapshot
+                self._step("snapshot_save", torch.save, model, model_file + ".tmp")
+                os.replace(model_file + ".tmp", model_file)
+        model.eval()
+
+        # first forward pass pays for kernel selection / allocator growth; do it before any user waits
+        with torch.no_grad():
+            warmup = tokenizer.encode("Hello" + tokenizer.eos_token, return_tensors="pt")
+            self._step("warmup", model, warmup)
+        return tokenizer, model
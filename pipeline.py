@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# -------------------- TIMINGS --------------------
+class StageTimings:
+    """Wall-clock milliseconds per stage; background stages report in when they finish."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def timed(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(stage, start)
+
+    def record(self, stage, start):
+        with self._lock:
+            self.stages[stage] = round((time.perf_counter() - start) * 1000, 1)
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self.stages)
+
+
+def record_when_done(timings, futures, start):
+    """Record ``tts_first_chunk`` and ``tts`` once the first / all sentence futures finish."""
+    if not futures:
+        return
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            timings.record("tts", start)
+
+    futures[0].add_done_callback(lambda _: timings.record("tts_first_chunk", start))
+    for future in futures:
+        future.add_done_callback(done)
+
+
+class PipelineResult:
+    def __init__(self, reply, polarity, audio, timings):
+        self.reply = reply
+        self.polarity = polarity
+        self.audio = audio          # one Future per sentence, still running when returned
+        self.timings = timings
+
+
+# -------------------- PIPELINE --------------------
+class MessagePipeline:
+    """translate in -> (sentiment || reply -> translate out) -> sentence TTS in the background.
+
+    ``reply`` runs on the calling thread because it touches Streamlit session state; the other
+    stages are plain functions and run on ``pool``, which callers may share across pipelines.
+    ``synthesize(text, lang)`` must return futures (one per sentence) without blocking.
+    """
+
+    def __init__(self, translate, score, reply, synthesize, pool=None, max_workers=4):
+        self.translate = translate
+        self.score = score
+        self.reply = reply
+        self.synthesize = synthesize
+        self.pool = pool or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="message-pipeline")
+
+    def run(self, user_text, lang="en"):
+        timings = StageTimings()
+        start = time.perf_counter()
+        text_en = timings.timed("translate_in", self.translate, user_text, src=lang, dest="en")
+        polarity = self.pool.submit(timings.timed, "sentiment", self.score, text_en)
+        reply_en = timings.timed("reply", self.reply, text_en)
+        reply = timings.timed("translate_out", self.translate, reply_en, src="en", dest=lang)
+        tts_start = time.perf_counter()
+        audio = self.synthesize(reply, lang)
+        record_when_done(timings, audio, tts_start)
+        result = PipelineResult(reply, polarity.result(), audio, timings)
+        timings.record("total", start)
+        return result
@@ -0,0 +1,119 @@
+import threading
+
+
+# -------------------- ENGINE --------------------
+class SentimentEngine:
+    """TextBlob/pattern polarity, compiled for bulk scoring.
+
+    The pattern lexicon is flattened once into a ``word -> (polarity, intensity, is_modifier)``
+    index, so scoring a message is a single pass over its tokens with no per-message TextBlob,
+    namedtuple or assessment-dict allocations. Assessments of a whole batch are collected into
+    flat arrays and averaged per message with NumPy. Duplicate messages are scored once.
+    The rules mirror ``textblob._text.Sentiment.assessments`` so results match
+    ``TextBlob(text).sentiment.polarity``.
+    """
+
+    def __init__(self):
+        from textblob._text import EMOTICONS, PUNCTUATION
+        from textblob.en import sentiment as lexicon
+
+        self.tokenizer = lexicon.tokenizer
+        self.negations = frozenset(lexicon.negations)
+        self.modifiers = tuple(lexicon.modifiers)
+        self.punctuation = PUNCTUATION      # a string: pattern tests substrings against it
+        self.entries = {}
+        for word, senses in lexicon.items():
+            if None in senses:
+                p, _, i = senses[None]
+                self.entries[word] = (p, i, any(m in senses for m in self.modifiers))
+        self.emoticons = {}
+        for (_, p), faces in EMOTICONS.items():
+            for face in faces:
+                self.emoticons.setdefault(face.lower(), p)
+
+    def tokens(self, text):
+        return [w.lower() for w in " ".join(self.tokenizer(text)).split()]
+
+    def assess(self, words):
+        """Return [polarity, intensity, negated] triples, as pattern's assessments() would."""
+        a = []
+        m = None    # preceding modifier ("really good")
+        n = None    # preceding negation ("not good")
+        for w in words:
+            entry = self.entries.get(w)
+            if entry is not None:
+                p, i, is_modifier = entry
+                if m is None:
+                    a.append([p, i, False])
+                else:
+                    last = a[-1]
+                    last[0] = max(-1.0, min(p * last[1], 1.0))
+                    last[1] = i
+                if n is not None:
+                    last = a[-1]
+                    last[1] = 1.0 / last[1]
+                    last[2] = True
+                m = w if is_modifier else None
+                n = w if w in self.negations else None
+            else:
+                if w in self.negations:
+                    n = w
+                elif n and len(w.strip("'")) > 1:
+                    n = None
+                if n is not None and m is not None and m.endswith("ly"):
+                    a[-1][2] = True
+                    n = None
+                elif m and len(w) > 2:
+                    m = None
+                if w == "!" and a:
+                    a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, 1.0))
+                if w == "(!)":
+                    a.append([0.0, 1.0, False])
+                if w.isalpha() is False and len(w) <= 5 and w not in self.punctuation:
+                    p = self.emoticons.get(w)
+                    if p is not None:
+                        a.append([p, 1.0, False])
+        return a
+
+    def polarities(self, texts):
+        """Polarity for every text in ``texts`` as a float64 array."""
+        import numpy as np
+
+        unique = {}
+        index = np.fromiter((unique.setdefault(t, len(unique)) for t in texts), dtype=np.intp)
+        owners, scores, negated = [], [], []
+        for row, text in enumerate(unique):
+            for p, _, neg in self.assess(self.tokens(text)):
+                owners.append(row)
+                scores.append(p)
+                negated.append(neg)
+        scores = np.asarray(scores, dtype=np.float64)
+        # "not good" = slightly bad, "not bad" = slightly good
+        scores = np.where(np.asarray(negated, dtype=bool), scores * -0.5, scores)
+        owners = np.asarray(owners, dtype=np.intp)
+        totals = np.bincount(owners, weights=scores, minlength=len(unique))
+        counts = np.bincount(owners, minlength=len(unique))
+        return (totals / np.maximum(counts, 1))[index]
+
+    def polarity(self, text):
+        return float(self.polarities([text])[0])
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = SentimentEngine()
+        return _engine
+
+
+def score_polarity(text_en):
+    return get_engine().polarity(text_en)
+
+
+def score_polarities(texts_en):
+    return get_engine().polarities(texts_en)
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import speech_recognition as sr
+
+SAMPLE_DTYPES = {1: "u1", 2: "<i2", 4: "<i4"}
+
+
+# -------------------- BACKENDS --------------------
+class GoogleRecognizer:
+    name = "google"
+
+    def __init__(self, language="en-IN"):
+        self.language = language
+
+    def recognize(self, audio):
+        try:
+            return sr.Recognizer().recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return ""   # chunk without intelligible speech
+
+
+class StubRecognizer:
+    """Offline stand-in for tests: describes each chunk instead of transcribing it."""
+
+    name = "stub"
+
+    def __init__(self, language="en-IN"):
+        self.language = language
+
+    def recognize(self, audio):
+        seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return f"<{seconds:.1f}s of speech>"
+
+
+RECOGNIZERS = {"google": GoogleRecognizer, "stub": StubRecognizer}
+
+
+# -------------------- AUDIO --------------------
+def load_audio(data):
+    """Decode WAV/AIFF/FLAC bytes held in memory into mono PCM ``AudioData``."""
+    with sr.AudioFile(BytesIO(data)) as source:
+        return sr.Recognizer().record(source)
+
+
+def split_on_silence(audio, frame_ms=30, min_silence_ms=400, silence_ratio=0.1, max_chunk_s=15):
+    """Cut PCM at pauses; returns memoryviews over ``audio.frame_data`` (no sample copies)."""
+    import numpy as np
+
+    pcm = memoryview(audio.frame_data)
+    width = audio.sample_width
+    if width not in SAMPLE_DTYPES:
+        return [pcm]
+    samples = np.frombuffer(pcm, dtype=SAMPLE_DTYPES[width])
+    if width == 1:
+        samples = samples.astype(np.int16) - 128
+
+    frame_len = max(int(audio.sample_rate * frame_ms / 1000), 1)
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return [pcm]
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt((frames ** 2).mean(axis=1))
+    silent = rms <= silence_ratio * np.percentile(rms, 95)
+
+    # cut in the middle of every pause that lasts at least min_silence_ms
+    min_run = max(min_silence_ms // frame_ms, 1)
+    cuts, run_start = [0], None
+    for i, quiet in enumerate(np.append(silent, False)):
+        if quiet and run_start is None:
+            run_start = i
+        elif not quiet and run_start is not None:
+            if i - run_start >= min_run and run_start > 0 and i < n_frames:
+                cuts.append((run_start + i) // 2)
+            run_start = None
+    cuts.append(n_frames)
+
+    max_frames = max(int(max_chunk_s * 1000 / frame_ms), 1)
+    bounds = []
+    for start, end in zip(cuts, cuts[1:]):
+        bounds.extend((s, min(s + max_frames, end)) for s in range(start, end, max_frames))
+    step = frame_len * width
+    chunks = []
+    for start, end in bounds:
+        if silent[start:end].all():
+            continue
+        # the last chunk also keeps the samples after the final full frame
+        chunks.append(pcm[start * step:len(pcm) if end == n_frames else end * step])
+    return chunks
+
+
+# -------------------- STREAMING RECOGNIZER --------------------
+class StreamingRecognizer:
+    """Transcribes silence-separated chunks in parallel and yields the text in order."""
+
+    def __init__(self, backend="google", language="en-IN", max_workers=4):
+        self.backend = RECOGNIZERS[backend](language) if isinstance(backend, str) else backend
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speech")
+
+    def stream(self, data):
+        audio = load_audio(data)
+        chunks = [sr.AudioData(chunk, audio.sample_rate, audio.sample_width)
+                  for chunk in split_on_silence(audio)]
+        # map submits every chunk up front and yields as soon as the next one in order is done
+        yield from self.pool.map(self.backend.recognize, chunks)
+
+    def transcribe(self, data):
+        text = " ".join(part for part in self.stream(data) if part)
+        if not text:
+            raise sr.UnknownValueError("no speech recognized")
+        return text
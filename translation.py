@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# -------------------- BACKENDS --------------------
+class GoogleBackend:
+    """deep_translator's GoogleTranslator, one reused instance per language pair and thread.
+
+    A GoogleTranslator stores the text being translated on the instance before sending the
+    request, so an instance must never be shared between threads (Streamlit sessions).
+    """
+
+    name = "google"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _translator(self, src, dest):
+        translators = self._local.__dict__.setdefault("translators", {})
+        if (src, dest) not in translators:
+            from deep_translator import GoogleTranslator
+            translators[(src, dest)] = GoogleTranslator(source=src, target=dest)
+        return translators[(src, dest)]
+
+    def translate_batch(self, texts, src, dest):
+        # deep_translator sends one request per text; this only saves the per-call construction
+        return self._translator(src, dest).translate_batch(list(texts))
+
+
+class StubBackend:
+    """Offline stand-in for tests and local runs: tags the text with the target language."""
+
+    name = "stub"
+
+    def translate_batch(self, texts, src, dest):
+        return [f"[{dest}] {text}" for text in texts]
+
+
+BACKENDS = {"google": GoogleBackend, "stub": StubBackend}
+
+
+# -------------------- CACHE --------------------
+class TranslationCache:
+    """In-memory LRU over an on-disk SQLite table, keyed by (src, dest, text)."""
+
+    def __init__(self, path=None, capacity=4096):
+        self.capacity = capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS translations ("
+                             "src TEXT, dest TEXT, text TEXT, result TEXT, PRIMARY KEY (src, dest, text))")
+            self._db.commit()
+
+    def lookup(self, keys):
+        """Return ({key: result}, memory_hits, disk_hits) for the keys that are cached."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            memory_hits = len(found)
+            if self._db is not None:
+                for key in keys:
+                    if key in found:
+                        continue
+                    row = self._db.execute("SELECT result FROM translations WHERE src=? AND dest=? AND text=?",
+                                           key).fetchone()
+                    if row is not None:
+                        found[key] = row[0]
+                        self._remember(key, row[0])
+        return found, memory_hits, len(found) - memory_hits
+
+    def store(self, items):
+        with self._lock:
+            for key, result in items.items():
+                self._remember(key, result)
+            if self._db is not None:
+                self._db.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                                     [key + (result,) for key, result in items.items()])
+                self._db.commit()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+
+# -------------------- TRANSLATOR --------------------
+class Translator:
+    def __init__(self, backend="google", cache_path=None, capacity=4096):
+        self.backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+        self.cache = TranslationCache(cache_path, capacity)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+                         "backend_calls": 0, "backend_seconds": 0.0}
+
+    def translate(self, text, src="en", dest="en"):
+        return self.translate_many([text], src, dest)[0]
+
+    def translate_many(self, texts, src="en", dest="en"):
+        if src == dest:
+            return list(texts)
+        keys = [(src, dest, text) for text in texts]
+        wanted = list(dict.fromkeys(key for key in keys if key[2].strip()))
+        found, memory_hits, disk_hits = self.cache.lookup(wanted)
+        misses = [key for key in wanted if key not in found]
+
+        elapsed = 0.0
+        if misses:
+            start = time.perf_counter()
+            results = self.backend.translate_batch([key[2] for key in misses], src, dest)
+            elapsed = time.perf_counter() - start
+            fresh = dict(zip(misses, results))
+            self.cache.store(fresh)
+            found.update(fresh)
+
+        with self._lock:
+            c = self.counters
+            c["requests"] += len(wanted)
+            c["memory_hits"] += memory_hits
+            c["disk_hits"] += disk_hits
+            c["misses"] += len(misses)
+            c["backend_calls"] += 1 if misses else 0
+            c["backend_seconds"] += elapsed
+        return [found.get(key, key[2]) for key in keys]
+
+    def stats(self):
+        with self._lock:
+            c = dict(self.counters)
+        hits = c["memory_hits"] + c["disk_hits"]
+        c["hit_rate"] = hits / c["requests"] if c["requests"] else 0.0
+        c["backend_ms_per_miss"] = 1000 * c["backend_seconds"] / c["misses"] if c["misses"] else 0.0
+        c["backend_seconds"] = round(c["backend_seconds"], 3)
+        return c
@@ -0,0 +1,242 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+
+SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+LOCALE = re.compile(r"^[a-z]{2,3}-[a-z0-9]{2,4}$", re.IGNORECASE)
+
+
+# -------------------- BACKENDS --------------------
+class GTTSBackend:
+    name = "gtts"
+    mime = "audio/mp3"
+    ext = "mp3"
+    languages = {"en", "hi", "bn", "gu", "kn", "ml", "mr", "ta", "te", "ur"}
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+        audio_bytes = BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(audio_bytes)
+        return audio_bytes.getvalue()
+
+    def speaks(self, lang):
+        return lang in self.languages
+
+
+class Pyttsx3Backend:
+    """Offline synthesis through the system speech engine (SAPI5 / NSSpeech / eSpeak).
+
+    pyttsx3 engines are bound to the thread that created them (SAPI5 also needs COM set up on
+    it), so every call runs on one dedicated worker thread.
+    """
+
+    name = "pyttsx3"
+    mime = "audio/wav"
+    ext = "wav"
+    languages = None    # whatever voices the system has; see speaks()
+
+    def __init__(self):
+        self._engine = None
+        self._voices = {}   # lang -> voice id, or None when no installed voice speaks it
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3",
+                                          initializer=self._init_thread)
+
+    @staticmethod
+    def _init_thread():
+        try:
+            import pythoncom
+        except ImportError:     # not on Windows / pywin32 missing
+            return
+        pythoncom.CoInitialize()
+
+    @staticmethod
+    def voice_languages(voice):
+        """Primary language subtags ("en", "hi", ...) a voice declares."""
+        tags = []
+        for tag in getattr(voice, "languages", None) or []:
+            if isinstance(tag, bytes):
+                tag = tag.decode("utf-8", "ignore")
+            tags.append(tag)
+        # SAPI5 / eSpeak ids carry the locale instead: ...\TTS_MS_EN-US_DAVID_11.0, gmw/en-US
+        tail = re.split(r"[\\/]", voice.id)[-1]
+        parts = tail.split("_")
+        tags.extend(p for p in parts if len(parts) == 1 or LOCALE.match(p))
+        langs = set()
+        for tag in tags:
+            tag = re.sub(r"^[^A-Za-z]+", "", str(tag)).lower().replace("_", "-")
+            if LOCALE.match(tag) or re.fullmatch(r"[a-z]{2,3}", tag):
+                langs.add(tag.split("-")[0])
+        return langs
+
+    def _init_engine(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+
+    def _voice_for(self, lang):
+        if lang not in self._voices:
+            self._init_engine()
+            self._voices[lang] = next((voice.id for voice in self._engine.getProperty("voices")
+                                       if lang in self.voice_languages(voice)), None)
+        return self._voices[lang]
+
+    def speaks(self, lang):
+        """Whether an installed voice speaks ``lang``; another language's voice would garble it."""
+        if lang in self._voices:
+            return self._voices[lang] is not None
+        return self._worker.submit(self._voice_for, lang).result() is not None
+
+    def synthesize(self, text, lang):
+        return self._worker.submit(self._synthesize, text, lang).result()
+
+    def _synthesize(self, text, lang):
+        voice = self._voice_for(lang)
+        if voice is None:
+            raise LookupError(f"no {self.name} voice for language {lang!r}")
+        self._engine.setProperty("voice", voice)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self._engine.save_to_file(text, path)
+            self._engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+
+BACKENDS = {"gtts": GTTSBackend, "pyttsx3": Pyttsx3Backend}
+
+
+# -------------------- CACHE --------------------
+class AudioCache:
+    """Content-addressed audio files on disk, evicted least-recently-used past ``max_bytes``."""
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._files = OrderedDict()     # file name -> size, oldest first
+        os.makedirs(directory, exist_ok=True)
+        names = [n for n in os.listdir(directory) if not n.endswith(".tmp")]
+        for name in sorted(names, key=lambda n: os.path.getmtime(os.path.join(directory, n))):
+            self._files[name] = os.path.getsize(os.path.join(directory, name))
+        self.size = sum(self._files.values())
+
+    @staticmethod
+    def key(backend, lang, text, ext):
+        digest = hashlib.sha256(f"{backend}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+        return f"{digest}.{ext}"
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+            path = os.path.join(self.directory, name)
+            try:
+                os.utime(path)
+                with open(path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                self.size -= self._files.pop(name)
+                return None
+
+    def put(self, name, data):
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+            self.size += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self.size > self.max_bytes and len(self._files) > 1:
+                old, size = self._files.popitem(last=False)
+                self.size -= size
+                try:
+                    os.remove(os.path.join(self.directory, old))
+                except FileNotFoundError:
+                    pass
+
+
+# -------------------- ENGINE --------------------
+class AudioChunk:
+    def __init__(self, data, mime, cached):
+        self.data = data
+        self.mime = mime
+        self.cached = cached
+
+
+def split_sentences(text):
+    return [s for s in (part.strip() for part in SENTENCE_END.split(text)) if s]
+
+
+class TTSEngine:
+    """Sentence-by-sentence synthesis with per-language backend routing and a shared disk cache.
+
+    ``submit`` returns one future per sentence, in order, so the first sentence can be played
+    while the rest are still being synthesized. It returns no futures when no backend speaks
+    the language; a backend that fails to start fails every future instead.
+    """
+
+    def __init__(self, cache_dir, max_bytes=50 * 1024 * 1024, offline=False, max_workers=4):
+        self.cache = AudioCache(cache_dir, max_bytes)
+        self.online = None if offline else GTTSBackend()
+        self.offline = Pyttsx3Backend()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self._lock = threading.Lock()
+        self.counters = {"sentences": 0, "cache_hits": 0, "synthesized": 0, "synth_seconds": 0.0}
+
+    def backend_for(self, lang):
+        if self.online is not None and lang in self.online.languages:
+            return self.online
+        return self.offline
+
+    def submit(self, text, lang="en"):
+        backend = self.backend_for(lang)
+        try:
+            if not backend.speaks(lang):
+                return []
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return [future]
+        futures = []
+        for sentence in split_sentences(text):
+            name = self.cache.key(backend.name, lang, sentence, backend.ext)
+            data = self.cache.get(name)
+            if data is not None:
+                future = Future()
+                future.set_result(AudioChunk(data, backend.mime, cached=True))
+                self._count(cache_hits=1)
+            else:
+                future = self.pool.submit(self._synthesize, backend, lang, sentence, name)
+            futures.append(future)
+        self._count(sentences=len(futures))
+        return futures
+
+    def _synthesize(self, backend, lang, sentence, name):
+        start = time.perf_counter()
+        data = backend.synthesize(sentence, lang)
+        self.cache.put(name, data)
+        self._count(synthesized=1, synth_seconds=time.perf_counter() - start)
+        return AudioChunk(data, backend.mime, cached=False)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counters[key] += delta
+
+    def stats(self):
+        with self._lock:
+            c = dict(self.counters)
+        c["hit_rate"] = c["cache_hits"] / c["sentences"] if c["sentences"] else 0.0
+        c["synth_seconds"] = round(c["synth_seconds"], 3)
+        c["cache_mb"] = round(self.cache.size / 1024 / 1024, 2)
+        return c